@@ -1,8 +1,11 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
+import pyarrow.dataset as ds
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.patches import Patch
+from preprocess import DAY_SCHEMA, HOUR_SCHEMA, convert_csv_to_parquet
 
 # Set page configuration
 st.set_page_config(
@@ -13,38 +16,115 @@ st.set_page_config(
 
 # Set matplotlib style to match original formatting
 
-# Function to load data
-@st.cache_data
-def load_data():
-    # Load day and hour data
-    day_df = pd.read_csv('data/day.csv')
-    hour_df = pd.read_csv('data/hour.csv')
-    
-    # Convert date strings to datetime
-    day_df['dteday'] = pd.to_datetime(day_df['dteday'])
-    hour_df['dteday'] = pd.to_datetime(hour_df['dteday'])
-    
-    # Create datetime column for hour data
-    hour_df['datetime'] = pd.to_datetime(hour_df['dteday']) + pd.to_timedelta(hour_df['hr'], unit='h')
+# Labels for the categorical codes (codes index these lists)
+YEAR_LABELS = ['2011', '2012']
+SEASON_LABELS = ['Winter', 'Spring', 'Summer', 'Fall']
+WEATHER_LABELS = ['Clear', 'Mist/Cloudy', 'Light Rain/Snow', 'Heavy Rain/Snow']
+
+# Reverse maps from label to categorical code
+YEAR_CODES = {label: code for code, label in enumerate(YEAR_LABELS)}
+SEASON_CODES = {label: code for code, label in enumerate(SEASON_LABELS)}
+WEATHER_CODES = {label: code for code, label in enumerate(WEATHER_LABELS)}
+
+# Function to put a dataset read from Parquet back in its CSV form: narrow dtypes, the yr partition column
+# in its original place and rows in chronological order (so each (year, season) period of the daily data
+# is one contiguous run)
+def tidy_frame(df, schema):
+    # The yr partition column comes back last, as a categorical of the partition values, and Parquet
+    # files written by an older conversion may still hold int64/float64 columns
+    df = df.astype(schema, copy=False)
+    df.insert(df.columns.get_loc('season') + 1, 'yr', df.pop('yr'))
+    return df.sort_values('instant', ignore_index=True)
+
+# Function to add the datetime column to hourly data (dteday + hr hours, as int64 nanosecond arithmetic)
+def add_datetime(hour_df):
+    hour_ns = 3_600_000_000_000
+    hour_df['datetime'] = (hour_df['dteday'].to_numpy(dtype='datetime64[ns]').view('i8')
+                           + hour_df['hr'].to_numpy(dtype=np.int64) * hour_ns).view('datetime64[ns]')
+    return hour_df
+
+# Function to map categorical variables to their meaningful representations
+def add_labels(df):
+    df['season_label'] = pd.Categorical.from_codes(df['season'].to_numpy() - 1, categories=SEASON_LABELS)
+    df['weathersit_label'] = pd.Categorical.from_codes(df['weathersit'].to_numpy() - 1, categories=WEATHER_LABELS)
+    df['yr_label'] = pd.Categorical.from_codes(df['yr'].to_numpy(), categories=YEAR_LABELS)
+    # Hourly data also gets the weekday/weekend label
+    if 'hr' in df.columns:
+        weekday = df['weekday'].to_numpy()
+        weekend = ((weekday == 0) | (weekday == 6)).astype(np.int8)
+        df['is_weekend'] = pd.Categorical.from_codes(weekend, categories=['Weekday', 'Weekend'])
+    return df
+
+# Function to load data for the selected years (cache_resource shares the frames by reference instead of
+# hashing and copying them on every hit)
+@st.cache_resource(show_spinner=False)
+def load_data(years):
+    if not (os.path.exists('data/day_by_yr') and os.path.exists('data/hour_by_yr')):
+        convert_csv_to_parquet()
     
-    # Map categorical variables to their meaningful representations
-    season_map = {1: 'Winter', 2: 'Spring', 3: 'Summer', 4: 'Fall'}
-    weather_map = {1: 'Clear', 2: 'Mist/Cloudy', 3: 'Light Rain/Snow', 4: 'Heavy Rain/Snow'}
-    year_map = {0: '2011', 1: '2012'}
+    # Load day and hour data, pushing the year filter down so unselected year partitions are never read
+    # (dteday is already datetime64)
+    day_df = pd.read_parquet('data/day_by_yr', engine='pyarrow', filters=[('yr', 'in', list(years))])
+    hour_df = pd.read_parquet('data/hour_by_yr', engine='pyarrow', filters=[('yr', 'in', list(years))])
+    day_df = add_labels(tidy_frame(day_df, DAY_SCHEMA))
+    hour_df = add_labels(tidy_frame(hour_df, HOUR_SCHEMA))
     
-    day_df['season_label'] = day_df['season'].map(season_map)
-    day_df['weathersit_label'] = day_df['weathersit'].map(weather_map)
-    day_df['yr_label'] = day_df['yr'].map(year_map)
+    # Pre-aggregate rental sums and row counts over every filter/grouping dimension once, so filtered
+    # means can be computed from these small cubes instead of the full frames
+    cube_aggs = dict(cnt=('cnt', 'sum'), casual=('casual', 'sum'), registered=('registered', 'sum'),
+                     rows=('cnt', 'size'))
+    day_keys = ['yr_label', 'season_label', 'weathersit_label', 'mnth']
+    hour_keys = ['yr_label', 'season_label', 'weathersit_label', 'hr', 'is_weekend']
+    day_cube = day_df.groupby(day_keys, observed=True).agg(**cube_aggs).reset_index()
+    hour_cube = hour_df.groupby(hour_keys, observed=True).agg(**cube_aggs).reset_index()
     
-    hour_df['season_label'] = hour_df['season'].map(season_map)
-    hour_df['weathersit_label'] = hour_df['weathersit'].map(weather_map)
-    hour_df['yr_label'] = hour_df['yr'].map(year_map)
-    hour_df['is_weekend'] = hour_df['weekday'].apply(lambda x: 'Weekend' if x in [0, 6] else 'Weekday')
+    # Boundaries of the contiguous (year, season) runs of daily rows, with the year and season code of each run
+    run_key = day_df['yr'].to_numpy() * len(SEASON_LABELS) + day_df['season_label'].cat.codes.to_numpy()
+    run_starts = np.flatnonzero(np.diff(run_key, prepend=-1))
+    run_stops = np.append(run_starts[1:], len(day_df))
+    run_years, run_seasons = np.divmod(run_key[run_starts], len(SEASON_LABELS))
+    day_runs = (run_starts, run_stops, run_years, run_seasons)
     
-    return day_df, hour_df
+    # Only the daily frame is kept; the hourly data is used through its cube alone
+    return day_df, day_cube, hour_cube, day_runs
+
+# Function to load the first rows of each dataset for the samples, independent of the year filter. Only
+# the first rows of the first year's partition are read; they get the same columns as the loaded frames.
+@st.cache_data(show_spinner=False)
+def load_samples():
+    first_year = ds.field('yr') == 0
+    day_sample = ds.dataset('data/day_by_yr', format='parquet', partitioning='hive').head(3, filter=first_year)
+    hour_sample = ds.dataset('data/hour_by_yr', format='parquet', partitioning='hive').head(3, filter=first_year)
+    day_sample = add_labels(tidy_frame(day_sample.to_pandas(), DAY_SCHEMA))
+    hour_sample = add_labels(add_datetime(tidy_frame(hour_sample.to_pandas(), HOUR_SCHEMA)))
+    return day_sample, hour_sample
+
+# Sidebar for filters
+st.sidebar.header("Filters")
+
+# Year filter
+year_filter = st.sidebar.multiselect(
+    "Select Year",
+    options=YEAR_LABELS,
+    default=YEAR_LABELS
+)
 
-# Load data
-day_df, hour_df = load_data()
+# Season filter
+season_filter = st.sidebar.multiselect(
+    "Select Season",
+    options=SEASON_LABELS,
+    default=SEASON_LABELS
+)
+
+# Weather filter
+weather_filter = st.sidebar.multiselect(
+    "Select Weather",
+    options=WEATHER_LABELS,
+    default=WEATHER_LABELS
+)
+
+# Load data for the selected years only (read-only)
+day_df, day_cube, hour_cube, day_runs = load_data(tuple(sorted(YEAR_CODES[year] for year in year_filter)))
 
 # Title and description
 st.title("🚲 Bike Sharing Visualization Dashboard")
@@ -71,164 +151,252 @@ with st.expander("About the Dataset"):
     - **cnt**: Total count of rentals
     """)
     
+    day_sample, hour_sample = load_samples()
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Daily Data Sample")
-        st.dataframe(day_df.head(3))
+        st.dataframe(day_sample)
     with col2:
         st.subheader("Hourly Data Sample")
-        st.dataframe(hour_df.head(3))
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-
-# Year filter
-year_filter = st.sidebar.multiselect(
-    "Select Year",
-    options=day_df['yr_label'].unique(),
-    default=day_df['yr_label'].unique()
-)
+        st.dataframe(hour_sample)
+
+# Function to build a boolean lookup table, indexed by code, of the selected labels
+def allowed_codes(label_codes, selected):
+    allowed = np.zeros(len(label_codes), dtype=bool)
+    allowed[np.fromiter((label_codes[label] for label in selected), dtype=np.intp, count=len(selected))] = True
+    return allowed
+
+# Function to build a row mask from the selected labels using the integer categorical codes
+def filter_mask(df, year_filter, season_filter, weather_filter):
+    mask = np.ones(len(df), dtype=bool)
+    for column, label_codes, selected in [('yr_label', YEAR_CODES, year_filter),
+                                          ('season_label', SEASON_CODES, season_filter),
+                                          ('weathersit_label', WEATHER_CODES, weather_filter)]:
+        # Gather the lookup table with each row's code
+        mask &= allowed_codes(label_codes, selected)[df[column].cat.codes.to_numpy()]
+    return mask
+
+# Function to compute mean rentals per group from the filtered rows of a pre-aggregated cube.
+# Groups are reduced with np.bincount on a mixed-radix integer key built from the grouping columns'
+# codes (categorical codes, or the small non-negative integer values themselves).
+def cube_mean(cube, by, year_filter, season_filter, weather_filter, values=('cnt', 'casual', 'registered')):
+    # Take only the grouping, value and row-count columns of the filtered rows
+    mask = filter_mask(cube, year_filter, season_filter, weather_filter)
+    cube = cube.iloc[mask, cube.columns.get_indexer([*by, *values, 'rows'])]
+    codes, sizes = [], []
+    for col in by:
+        if isinstance(cube[col].dtype, pd.CategoricalDtype):
+            codes.append(cube[col].cat.codes.to_numpy())
+            sizes.append(len(cube[col].cat.categories))
+        else:
+            codes.append(cube[col].to_numpy())
+            sizes.append(int(codes[-1].max()) + 1 if len(cube) else 1)
+    group_key = np.ravel_multi_index(codes, sizes)
+    rows = np.bincount(group_key, weights=cube['rows'], minlength=np.prod(sizes))
+    observed = np.flatnonzero(rows)
+    result = pd.DataFrame()
+    for col, col_codes in zip(by, np.unravel_index(observed, sizes)):
+        if isinstance(cube[col].dtype, pd.CategoricalDtype):
+            col_codes = pd.Categorical.from_codes(col_codes, dtype=cube[col].dtype)
+        result[col] = col_codes
+    for col in values:
+        result[col] = np.bincount(group_key, weights=cube[col], minlength=np.prod(sizes))[observed] / rows[observed]
+    return result
+
+# Daily row positions and aggregation functions, cached per filter selection so reruns that don't change
+# the filters reuse them. Charts that need raw daily rows project only their own columns through the
+# positions instead of materializing every column of the filtered frame.
+@st.cache_data
+def get_day_rows(year_filter, season_filter, weather_filter):
+    # Year and season select whole contiguous runs; only the weather filter is checked row by row
+    run_starts, run_stops, run_years, run_seasons = day_runs
+    selected = allowed_codes(YEAR_CODES, year_filter)[run_years]
+    selected &= allowed_codes(SEASON_CODES, season_filter)[run_seasons]
+    run_rows = [np.arange(start, stop) for start, stop in zip(run_starts[selected], run_stops[selected])]
+    rows = np.concatenate(run_rows) if run_rows else np.empty(0, dtype=np.intp)
+    weather_codes = day_df['weathersit_label'].cat.codes.to_numpy()[rows]
+    return rows[allowed_codes(WEATHER_CODES, weather_filter)[weather_codes]]
+
+# Function to take the given columns of the selected daily rows
+def day_columns(rows, columns):
+    return day_df.iloc[rows, day_df.columns.get_indexer(columns)]
 
-# Season filter
-season_filter = st.sidebar.multiselect(
-    "Select Season",
-    options=day_df['season_label'].unique(),
-    default=day_df['season_label'].unique()
-)
+@st.cache_data
+def hourly_agg(year_filter, season_filter, weather_filter):
+    # One aggregation serves both hourly charts (Q2 uses cnt, Q3 uses casual/registered)
+    return cube_mean(hour_cube, ['hr', 'is_weekend'], year_filter, season_filter, weather_filter)
 
-# Weather filter
-weather_filter = st.sidebar.multiselect(
-    "Select Weather",
-    options=day_df['weathersit_label'].unique(),
-    default=day_df['weathersit_label'].unique()
-)
+@st.cache_data
+def monthly_trends_agg(year_filter, season_filter, weather_filter):
+    return cube_mean(day_cube, ['mnth', 'yr_label'], year_filter, season_filter, weather_filter, values=['cnt'])
 
-# Apply filters
-filtered_day_df = day_df[
-    (day_df['yr_label'].isin(year_filter)) &
-    (day_df['season_label'].isin(season_filter)) &
-    (day_df['weathersit_label'].isin(weather_filter))
-]
+@st.cache_data
+def seasonal_user_agg(year_filter, season_filter, weather_filter):
+    return cube_mean(day_cube, ['season_label'], year_filter, season_filter, weather_filter)
 
-filtered_hour_df = hour_df[
-    (hour_df['yr_label'].isin(year_filter)) &
-    (hour_df['season_label'].isin(season_filter)) &
-    (hour_df['weathersit_label'].isin(weather_filter))
-]
+@st.cache_data
+def correlation_agg(year_filter, season_filter, weather_filter):
+    corr_vars = ['temp', 'atemp', 'hum', 'windspeed', 'casual', 'registered', 'cnt']
+    day_rows = get_day_rows(year_filter, season_filter, weather_filter)
+    # Fewer than two days have no correlation; return NaN like DataFrame.corr() does
+    if len(day_rows) < 2:
+        return pd.DataFrame(np.nan, index=corr_vars, columns=corr_vars)
+    # Columns are dense with no NaN, so np.corrcoef on the raw array gives the same result as DataFrame.corr()
+    # (a constant column gives NaN, which DataFrame.corr() also returns without a warning)
+    arr = day_columns(day_rows, corr_vars).to_numpy(dtype=np.float32, copy=False).T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame(np.corrcoef(arr), index=corr_vars, columns=corr_vars)
+
+# Apply filters (sorted so the same selection in a different click order hits the same cache entry)
+filters = (tuple(sorted(year_filter)), tuple(sorted(season_filter)), tuple(sorted(weather_filter)))
+day_rows = get_day_rows(*filters)
 
 # Key metrics cards
 st.header("Key Metrics")
 col1, col2, col3, col4 = st.columns(4)
 
+# All totals in one reduction over the filtered day cube
+metric_columns = day_cube.columns.get_indexer(['cnt', 'casual', 'registered', 'rows'])
+metric_totals = day_cube.iloc[filter_mask(day_cube, *filters), metric_columns].to_numpy(dtype=np.int64).sum(axis=0)
+total_rentals, casual_rentals, registered_rentals, n_days = metric_totals
+
 with col1:
-    total_rentals = filtered_day_df['cnt'].sum()
-    st.metric("Total Bike Rentals", f"{total_rentals:,}")
+    st.metric("Total Bike Rentals", f"{int(total_rentals):,}")
 
+# Guard the divisions so an empty selection shows zeros instead of NaN
 with col2:
-    avg_daily_rentals = filtered_day_df['cnt'].mean()
+    avg_daily_rentals = total_rentals / max(n_days, 1)
     st.metric("Average Daily Rentals", f"{avg_daily_rentals:.1f}")
 
 with col3:
-    casual_percentage = (filtered_day_df['casual'].sum() / total_rentals) * 100
+    casual_percentage = (casual_rentals / max(total_rentals, 1)) * 100
     st.metric("Casual Riders", f"{casual_percentage:.1f}%")
 
 with col4:
-    registered_percentage = (filtered_day_df['registered'].sum() / total_rentals) * 100
+    registered_percentage = (registered_rentals / max(total_rentals, 1)) * 100
     st.metric("Registered Riders", f"{registered_percentage:.1f}%")
 
 # Business Question 1: Weather Impact Analysis
 st.header("1. How do weather conditions impact bike rentals across different seasons?")
 
-plt.figure(figsize=(12, 7))
-sns.boxplot(x='season_label', y='cnt', hue='weathersit_label', data=filtered_day_df)
-plt.title('Bike Rentals by Season and Weather Condition')
-plt.xlabel('Season')
-plt.ylabel('Number of Rentals')
-plt.xticks(rotation=0)
-plt.legend(title='Weather', loc='upper left')
-plt.tight_layout()
-st.pyplot(plt)
+# One box per (season, weather) group, dodged within each season slot and coloured by weather
+box_df = day_columns(day_rows, ['season_label', 'weathersit_label', 'cnt'])
+seasons = box_df['season_label'].cat.remove_unused_categories().cat.categories
+weathers = box_df['weathersit_label'].cat.remove_unused_categories().cat.categories
+box_width = 0.8 / max(len(weathers), 1)
+box_data, box_positions, box_colors = [], [], []
+for (season, weather), group in box_df.groupby(['season_label', 'weathersit_label'], observed=True)['cnt']:
+    weather_idx = weathers.get_loc(weather)
+    box_data.append(group.to_numpy())
+    box_positions.append(seasons.get_loc(season) - 0.4 + box_width * (weather_idx + 0.5))
+    box_colors.append(f'C{weather_idx}')
+
+fig, ax = plt.subplots(figsize=(12, 7))
+if box_data:
+    boxes = ax.boxplot(box_data, positions=box_positions, widths=box_width * 0.8, patch_artist=True,
+                       medianprops={'color': 'black'})
+    for box, color in zip(boxes['boxes'], box_colors):
+        box.set_facecolor(color)
+ax.set_xticks(range(len(seasons)), labels=seasons)
+ax.set_title('Bike Rentals by Season and Weather Condition')
+ax.set_xlabel('Season')
+ax.set_ylabel('Number of Rentals')
+ax.legend(handles=[Patch(facecolor=f'C{i}', label=weather) for i, weather in enumerate(weathers)],
+          title='Weather', loc='upper left')
+fig.tight_layout()
+st.pyplot(fig)
+plt.close(fig)
 
 # Business Question 2: Peak Hours Analysis
 st.header("2. What are the peak hours for bike rentals and how do they differ between weekdays and weekends?")
 
-hourly_pattern = filtered_hour_df.groupby(['hr', 'is_weekend'])['cnt'].mean().reset_index()
-plt.figure(figsize=(12, 6))
-sns.lineplot(x='hr', y='cnt', hue='is_weekend', data=hourly_pattern, marker='o')
-plt.title('Average Hourly Bike Rentals: Weekdays vs. Weekends')
-plt.xlabel('Hour of Day')
-plt.ylabel('Average Number of Rentals')
-plt.xticks(range(0, 24))
-plt.grid(True, linestyle='--', alpha=0.7)
-plt.legend(title='Day Type')
-plt.tight_layout()
-st.pyplot(plt)
+hourly_all = hourly_agg(*filters)
+fig, ax = plt.subplots(figsize=(12, 6))
+for day_type, hourly_pattern in hourly_all.groupby('is_weekend', observed=True):
+    ax.plot(hourly_pattern['hr'], hourly_pattern['cnt'], marker='o', label=day_type)
+ax.set_title('Average Hourly Bike Rentals: Weekdays vs. Weekends')
+ax.set_xlabel('Hour of Day')
+ax.set_ylabel('Average Number of Rentals')
+ax.set_xticks(range(0, 24))
+ax.grid(True, linestyle='--', alpha=0.7)
+ax.legend(title='Day Type')
+fig.tight_layout()
+st.pyplot(fig)
+plt.close(fig)
 
 # Business Question 3: User Type Analysis
 st.header("3. How do usage patterns differ between casual and registered users throughout the day?")
 
-hourly_by_user = filtered_hour_df.groupby(['hr', 'is_weekend'])[['casual', 'registered']].mean().reset_index()
-hourly_by_user_melted = pd.melt(hourly_by_user,
-                                id_vars=['hr', 'is_weekend'],
-                                value_vars=['casual', 'registered'],
-                                var_name='user_type',
-                                value_name='avg_count')
-
-plt.figure(figsize=(14, 7))
-sns.lineplot(x='hr', y='avg_count', hue='user_type', style='is_weekend', data=hourly_by_user_melted, marker='o')
-plt.title('Average Hourly Bike Rentals by User Type: Weekdays vs. Weekends')
-plt.xlabel('Hour of Day')
-plt.ylabel('Average Number of Rentals')
-plt.xticks(range(0, 24))
-plt.grid(True, linestyle='--', alpha=0.7)
-plt.legend(title='User Type / Day')
-plt.tight_layout()
-st.pyplot(plt)
+# Colour by user type, line style by day type
+fig, ax = plt.subplots(figsize=(14, 7))
+for color, user_type in [('C0', 'casual'), ('C1', 'registered')]:
+    for linestyle, (day_type, hourly_by_user) in zip(['-', '--'], hourly_all.groupby('is_weekend', observed=True)):
+        ax.plot(hourly_by_user['hr'], hourly_by_user[user_type], color=color, linestyle=linestyle, marker='o',
+                label=f'{user_type} / {day_type}')
+ax.set_title('Average Hourly Bike Rentals by User Type: Weekdays vs. Weekends')
+ax.set_xlabel('Hour of Day')
+ax.set_ylabel('Average Number of Rentals')
+ax.set_xticks(range(0, 24))
+ax.grid(True, linestyle='--', alpha=0.7)
+ax.legend(title='User Type / Day')
+fig.tight_layout()
+st.pyplot(fig)
+plt.close(fig)
 
 # Business Question 4: Monthly and Yearly Trends
 st.header("4. How do bike rentals fluctuate throughout the year and between different years?")
 
-monthly_trends = filtered_day_df.groupby(['mnth', 'yr_label'])['cnt'].mean().reset_index()
-
-plt.figure(figsize=(12, 6))
-sns.lineplot(x='mnth', y='cnt', hue='yr_label', data=monthly_trends, marker='o')
-plt.title('Average Monthly Bike Rentals by Year')
-plt.xlabel('Month')
-plt.ylabel('Average Number of Rentals')
-plt.xticks(range(1, 13), ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
-plt.grid(True, linestyle='--', alpha=0.7)
-plt.legend(title='Year')
-plt.tight_layout()
-st.pyplot(plt)
+monthly_trends = monthly_trends_agg(*filters)
+
+fig, ax = plt.subplots(figsize=(12, 6))
+for year, yearly_trend in monthly_trends.groupby('yr_label', observed=True):
+    ax.plot(yearly_trend['mnth'], yearly_trend['cnt'], marker='o', label=year)
+ax.set_title('Average Monthly Bike Rentals by Year')
+ax.set_xlabel('Month')
+ax.set_ylabel('Average Number of Rentals')
+ax.set_xticks(range(1, 13), ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+ax.grid(True, linestyle='--', alpha=0.7)
+ax.legend(title='Year')
+fig.tight_layout()
+st.pyplot(fig)
+plt.close(fig)
 
 # Seasonal User Analysis
 st.header("Average Seasonal Bike Rentals by User Type")
 
-seasonal_user_trends = filtered_day_df.groupby('season_label')[['casual', 'registered', 'cnt']].mean().reset_index()
-seasonal_user_melted = pd.melt(seasonal_user_trends,
-                              id_vars=['season_label'],
-                              value_vars=['casual', 'registered'],
-                              var_name='user_type',
-                              value_name='avg_count')
-
-plt.figure(figsize=(10, 6))
-sns.barplot(x='season_label', y='avg_count', hue='user_type', data=seasonal_user_melted)
-plt.title('Average Seasonal Bike Rentals by User Type')
-plt.xlabel('Season')
-plt.ylabel('Average Number of Rentals')
-plt.xticks(rotation=0)
-plt.legend(title='User Type')
-plt.tight_layout()
-st.pyplot(plt)
+seasonal_user_trends = seasonal_user_agg(*filters)
+
+fig, ax = plt.subplots(figsize=(10, 6))
+x = np.arange(len(seasonal_user_trends))
+ax.bar(x - 0.2, seasonal_user_trends['casual'], width=0.4, label='casual')
+ax.bar(x + 0.2, seasonal_user_trends['registered'], width=0.4, label='registered')
+ax.set_xticks(x, labels=seasonal_user_trends['season_label'])
+ax.set_title('Average Seasonal Bike Rentals by User Type')
+ax.set_xlabel('Season')
+ax.set_ylabel('Average Number of Rentals')
+ax.legend(title='User Type')
+fig.tight_layout()
+st.pyplot(fig)
+plt.close(fig)
 
 # Correlation Analysis
 st.header("Correlation Analysis")
 
-correlation = filtered_day_df[['temp', 'atemp', 'hum', 'windspeed', 'casual', 'registered', 'cnt']].corr()
+correlation = correlation_agg(*filters)
 
 # Correlation heatmap
-plt.figure(figsize=(12, 8))
-sns.heatmap(correlation, annot=True, cmap='coolwarm', fmt='.2f')
-plt.title('Correlation Matrix of Numerical Features')
-plt.tight_layout()
-st.pyplot(plt)
\ No newline at end of file
+fig, ax = plt.subplots(figsize=(12, 8))
+values = correlation.to_numpy()
+im = ax.imshow(values, cmap='coolwarm', vmin=-1, vmax=1, aspect='auto')
+ax.set_xticks(range(len(correlation.columns)), labels=correlation.columns, rotation=45, ha='right')
+ax.set_yticks(range(len(correlation.index)), labels=correlation.index)
+fig.colorbar(im, ax=ax)
+# Format all annotations at once, then place them (NaN cells are left blank)
+annotations = np.char.mod('%.2f', values)
+text_colors = np.where(np.abs(values) > 0.75, 'white', 'black')
+for i, j in zip(*np.nonzero(~np.isnan(values))):
+    ax.text(j, i, annotations[i, j], ha='center', va='center', color=text_colors[i, j])
+ax.set_title('Correlation Matrix of Numerical Features')
+fig.tight_layout()
+st.pyplot(fig)
+plt.close(fig)
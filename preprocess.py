@@ -0,0 +1,20 @@
+import pandas as pd
+
+# Explicit column dtypes for the raw CSV files: codes fit int8, normalized weather values fit float32
+DAY_SCHEMA = {
+    'instant': 'int32', 'season': 'int8', 'yr': 'int8', 'mnth': 'int8', 'holiday': 'int8', 'weekday': 'int8',
+    'workingday': 'int8', 'weathersit': 'int8', 'temp': 'float32', 'atemp': 'float32', 'hum': 'float32',
+    'windspeed': 'float32', 'casual': 'int32', 'registered': 'int32', 'cnt': 'int32'
+}
+HOUR_SCHEMA = {**DAY_SCHEMA, 'hr': 'int8'}
+
+# Function to convert the raw CSV files to Parquet datasets partitioned by year (run once)
+def convert_csv_to_parquet():
+    # Parse with the multithreaded Arrow CSV reader and store the narrow dtypes and datetime in the Parquet files
+    for name, schema in [('day', DAY_SCHEMA), ('hour', HOUR_SCHEMA)]:
+        df = pd.read_csv(f'data/{name}.csv', engine='pyarrow', dtype=schema, parse_dates=['dteday'])
+        df.to_parquet(f'data/{name}_by_yr', engine='pyarrow', compression='zstd', partition_cols=['yr'],
+                      basename_template='part-{i}.parquet', existing_data_behavior='delete_matching')
+
+if __name__ == '__main__':
+    convert_csv_to_parquet()